@@ -1,20 +1,73 @@
+import math
+
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 import logging
-from scipy.stats import gaussian_kde
-from sklearn.cluster import DBSCAN
+
+# scipy and sklearn are imported lazily inside the methods that need
+# them, so importing this module (e.g. for the dashboard) does not pay
+# for loading the full scientific stack up front
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional speedup
+    njit = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_EARTH_RADIUS_KM = 6371.0  # Earth's radius in kilometers
+
+
+def _haversine_km(lat1: float, lon1: float,
+                  lat2: float, lon2: float) -> float:
+    """Scalar great-circle distance in kilometers between two points."""
+    lat1 = math.radians(lat1)
+    lon1 = math.radians(lon1)
+    lat2 = math.radians(lat2)
+    lon2 = math.radians(lon2)
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+if njit is not None:
+    # Compiles to allocation-free scalar trig ops, which matters when
+    # the function is called from a Python loop
+    _haversine_km = njit(cache=True, fastmath=True)(_haversine_km)
+
 class WhaleHabitatAnalyzer:
     """Class for analyzing whale habitat preferences and migration patterns."""
-    
+
+    EARTH_RADIUS_KM = _EARTH_RADIUS_KM
+    CLUSTER_EPS_KM = 111.0  # Clustering radius (~1 degree at the equator)
+
     def __init__(self, df: pd.DataFrame):
         self.df = df
         self._validate_data()
+        self._neighbor_graph_cache = {}
+        # Cache coordinates once as a compact contiguous array; pulling
+        # them out of the DataFrame copies an (N, 2) float64 block on
+        # every call, and float32 halves the bytes moved through
+        # clustering and density estimation
+        self._coords = np.ascontiguousarray(
+            self.df[['longitude', 'latitude']].to_numpy(dtype=np.float32)
+        )
+        # Shared Scott's-rule bandwidth (degrees), computed once on the
+        # full dataset so per-group density estimates skip the
+        # rule-of-thumb recomputation and stay comparable across groups
+        if len(self._coords):
+            factor = len(self._coords) ** (-1.0 / 6)
+            self._kde_bandwidth = (
+                float(factor * self._coords[:, 0].std()),
+                float(factor * self._coords[:, 1].std())
+            )
+        else:
+            self._kde_bandwidth = (0.0, 0.0)
     
     def _validate_data(self):
         """Validate the input data."""
@@ -36,11 +89,16 @@ class WhaleHabitatAnalyzer:
         Returns:
             Dictionary containing habitat preference metrics
         """
-        # Filter data if species is specified
-        df_filtered = self.df.copy()
+        # Filter data if species is specified; positions track each row
+        # back into the cached coordinate array
+        positions = np.arange(len(self.df))
         if species:
-            df_filtered = df_filtered[df_filtered['scientificname'] == species]
-        
+            mask = (self.df['scientificname'] == species).to_numpy()
+            df_filtered = self.df[mask]
+            positions = positions[mask]
+        else:
+            df_filtered = self.df
+
         # Group by time period if specified
         if time_period:
             if time_period == 'year':
@@ -49,34 +107,124 @@ class WhaleHabitatAnalyzer:
                 group_col = 'season'
             else:
                 raise ValueError("time_period must be 'year' or 'season'")
-            
+
             results = {}
-            for period, group in df_filtered.groupby(group_col):
-                results[period] = self._calculate_habitat_metrics(group)
+            for period, local_idx in df_filtered.groupby(group_col, observed=True).indices.items():
+                results[period] = self._calculate_habitat_metrics(
+                    df_filtered.iloc[local_idx], positions[local_idx]
+                )
             return results
         else:
-            return self._calculate_habitat_metrics(df_filtered)
+            return self._calculate_habitat_metrics(df_filtered, positions)
     
-    def _calculate_habitat_metrics(self, df: pd.DataFrame) -> Dict:
-        """Calculate habitat preference metrics for a given dataset."""
+    def _cluster_sightings(self, coordinates: np.ndarray):
+        """
+        Cluster sighting coordinates with DBSCAN using great-circle
+        (haversine) distances and a BallTree neighborhood graph.
+
+        Coordinates are expected as (longitude, latitude) degrees and
+        are converted to (latitude, longitude) radians for the
+        haversine metric, so the clustering radius is a true distance
+        on the sphere rather than Euclidean degrees. The sparse radius
+        graph is cached on the instance so repeated clustering of the
+        same coordinate set (e.g. habitat metrics and migration
+        corridors for one species) reuses the neighborhood queries
+        instead of recomputing them.
+        """
+        from sklearn.cluster import DBSCAN
+        from sklearn.neighbors import NearestNeighbors, sort_graph_by_row_values
+
+        eps = self.CLUSTER_EPS_KM / self.EARTH_RADIUS_KM  # radians on unit sphere
+        cache_key = (len(coordinates), hash(coordinates.tobytes()))
+        graph = self._neighbor_graph_cache.get(cache_key)
+        if graph is None:
+            coords_rad = np.radians(coordinates[:, ::-1])
+            nn = NearestNeighbors(
+                radius=eps,
+                algorithm='ball_tree',
+                metric='haversine'
+            ).fit(coords_rad)
+            graph = sort_graph_by_row_values(
+                nn.radius_neighbors_graph(coords_rad, mode='distance'),
+                warn_when_not_sorted=False
+            )
+            self._neighbor_graph_cache[cache_key] = graph
+        return DBSCAN(eps=eps, min_samples=5, metric='precomputed').fit(graph)
+
+    def _calculate_habitat_metrics(self, df: pd.DataFrame, positions: np.ndarray) -> Dict:
+        """
+        Calculate habitat preference metrics for a given dataset.
+
+        Args:
+            df: Rows to analyze
+            positions: Positional indices of those rows into the cached
+                coordinate array
+        """
         if df.empty:
             return {}
-            
-        # Calculate density using kernel density estimation
-        coordinates = df[['longitude', 'latitude']].values
-        kde = gaussian_kde(coordinates.T)
-        
+
+        # Calculate density using FFT-based kernel density estimation
+        coordinates = self._coords[positions]
+        density = self._estimate_density(coordinates)
+
         # Find hotspots using DBSCAN clustering
-        clustering = DBSCAN(eps=1.0, min_samples=5).fit(coordinates)
+        clustering = self._cluster_sightings(coordinates)
         hotspots = df[clustering.labels_ != -1]
-        
+
         return {
             'total_sightings': len(df),
             'unique_locations': len(df[['latitude', 'longitude']].drop_duplicates()),
             'hotspot_count': len(hotspots),
-            'density_estimate': kde,
+            'density_estimate': density,
             'hotspots': hotspots
         }
+
+    def _estimate_density(self, coordinates: np.ndarray, grid_size: int = 512) -> Dict:
+        """
+        Estimate sighting density on a regular lon/lat grid.
+
+        Bins the coordinates with a 2-D histogram and smooths the
+        counts with an FFT-convolved Gaussian kernel whose bandwidth
+        follows Scott's rule. Evaluating the grid this way is
+        O((n + m) log m) instead of the O(n * m) cost of calling a
+        pointwise gaussian_kde on every grid node.
+
+        Returns:
+            Dictionary with 'lon' and 'lat' grid-center arrays and a
+            (grid_size, grid_size) 'density' array
+        """
+        from scipy.signal import fftconvolve
+
+        hist, lon_edges, lat_edges = np.histogram2d(
+            coordinates[:, 0], coordinates[:, 1], bins=grid_size
+        )
+
+        # Cached Scott's-rule bandwidth, converted to grid cells
+        bw_lon, bw_lat = self._kde_bandwidth
+        lon_cell = (lon_edges[-1] - lon_edges[0]) / grid_size
+        lat_cell = (lat_edges[-1] - lat_edges[0]) / grid_size
+        # Clamp the bandwidth to the grid extent: the shared bandwidth
+        # can dwarf a geographically tight group's cell size, and a
+        # kernel wider than the grid adds nothing beyond a uniform
+        # smooth while its size grows without bound
+        sigma_lon = min(max(bw_lon / max(lon_cell, 1e-12), 0.5), grid_size)
+        sigma_lat = min(max(bw_lat / max(lat_cell, 1e-12), 0.5), grid_size)
+
+        # Separable Gaussian kernel truncated at four standard
+        # deviations, never wider than the grid itself
+        half = min(int(np.ceil(4 * max(sigma_lon, sigma_lat))), grid_size)
+        offsets = np.arange(-half, half + 1)
+        kernel = np.outer(
+            np.exp(-0.5 * (offsets / sigma_lon) ** 2),
+            np.exp(-0.5 * (offsets / sigma_lat) ** 2)
+        )
+        kernel /= kernel.sum()
+
+        return {
+            'lon': (lon_edges[:-1] + lon_edges[1:]) / 2,
+            'lat': (lat_edges[:-1] + lat_edges[1:]) / 2,
+            'density': fftconvolve(hist, kernel, mode='same')
+        }
     
     def analyze_migration_patterns(self, 
                                  species: str,
@@ -92,103 +240,124 @@ class WhaleHabitatAnalyzer:
             Dictionary containing migration pattern metrics
         """
         # Filter data for the specified species
-        df_species = self.df[self.df['scientificname'] == species].copy()
-        
+        mask = (self.df['scientificname'] == species).to_numpy()
+        df_species = self.df[mask]
+        positions = np.flatnonzero(mask)
+
         if df_species.empty:
             logger.warning(f"No data found for species: {species}")
             return {}
-        
+
         # Calculate centroids for each time period
-        centroids = self._calculate_centroids(df_species, time_window)
-        
+        centroids, centroid_lat, centroid_lon = self._calculate_centroids(df_species, time_window)
+
         # Calculate migration metrics
         metrics = {
             'centroids': centroids,
-            'total_distance': self._calculate_total_distance(centroids),
+            'total_distance': self._calculate_total_distance(centroid_lat, centroid_lon),
             'seasonal_ranges': self._calculate_seasonal_ranges(df_species),
-            'migration_corridors': self._identify_migration_corridors(df_species)
+            'migration_corridors': self._identify_migration_corridors(df_species, positions)
         }
         
         return metrics
     
-    def _calculate_centroids(self, 
-                           df: pd.DataFrame, 
-                           time_window: str) -> pd.DataFrame:
-        """Calculate centroids for each time period."""
+    def _calculate_centroids(self,
+                           df: pd.DataFrame,
+                           time_window: str) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Calculate centroids for each time period.
+
+        Returns the centroid table plus raw latitude/longitude arrays
+        in time order, so distance computations can work on NumPy
+        arrays instead of per-row pandas access.
+        """
         if time_window == 'month':
             group_col = 'month'
         else:
             group_col = 'season'
-            
-        centroids = df.groupby(group_col).agg({
+
+        agg = df.groupby(group_col, observed=True).agg({
             'latitude': 'mean',
             'longitude': 'mean',
             'eventdate': 'count'
-        }).reset_index()
-        
+        })
+        lat_array = agg['latitude'].to_numpy()
+        lon_array = agg['longitude'].to_numpy()
+
+        centroids = agg.reset_index()
         centroids.columns = [group_col, 'centroid_lat', 'centroid_lon', 'sighting_count']
-        return centroids
-    
-    def _calculate_total_distance(self, centroids: pd.DataFrame) -> float:
-        """Calculate total migration distance based on centroids."""
-        if len(centroids) < 2:
+        return centroids, lat_array, lon_array
+
+    def _calculate_total_distance(self, lat: np.ndarray, lon: np.ndarray) -> float:
+        """Calculate total migration distance along consecutive centroids."""
+        if len(lat) < 2:
             return 0.0
-            
-        # Calculate distances between consecutive centroids
-        distances = []
-        for i in range(len(centroids) - 1):
-            lat1, lon1 = centroids.iloc[i][['centroid_lat', 'centroid_lon']]
-            lat2, lon2 = centroids.iloc[i+1][['centroid_lat', 'centroid_lon']]
-            distance = self._haversine_distance(lat1, lon1, lat2, lon2)
-            distances.append(distance)
-            
-        return sum(distances)
+
+        # Vectorized haversine over consecutive centroid pairs
+        lat = np.radians(lat)
+        lon = np.radians(lon)
+        dlat = np.diff(lat)
+        dlon = np.diff(lon)
+
+        a = np.sin(dlat/2)**2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon/2)**2
+        distances = 2 * self.EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+        return float(distances.sum())
     
     def _calculate_seasonal_ranges(self, df: pd.DataFrame) -> Dict:
         """Calculate seasonal ranges for the species."""
-        seasonal_ranges = {}
-        for season, group in df.groupby('season'):
-            lat_range = (group['latitude'].min(), group['latitude'].max())
-            lon_range = (group['longitude'].min(), group['longitude'].max())
-            seasonal_ranges[season] = {
-                'latitude_range': lat_range,
-                'longitude_range': lon_range
+        # One aggregation pass instead of four min/max scans per season;
+        # observed=True skips seasons absent from the data
+        agg = df.groupby('season', observed=True)[['latitude', 'longitude']].agg(['min', 'max'])
+
+        return {
+            season: {
+                'latitude_range': (row[('latitude', 'min')], row[('latitude', 'max')]),
+                'longitude_range': (row[('longitude', 'min')], row[('longitude', 'max')])
             }
-        return seasonal_ranges
+            for season, row in agg.iterrows()
+        }
     
-    def _identify_migration_corridors(self, df: pd.DataFrame) -> List[Dict]:
-        """Identify potential migration corridors based on sighting density."""
+    def _identify_migration_corridors(self, df: pd.DataFrame, positions: np.ndarray) -> List[Dict]:
+        """
+        Identify potential migration corridors based on sighting density.
+
+        Args:
+            df: Rows to analyze
+            positions: Positional indices of those rows into the cached
+                coordinate array
+        """
         # Use DBSCAN to identify clusters of sightings
-        coordinates = df[['longitude', 'latitude']].values
-        clustering = DBSCAN(eps=1.0, min_samples=5).fit(coordinates)
+        coordinates = self._coords[positions]
+        clustering = self._cluster_sightings(coordinates)
         
+        # Group rows per cluster with one stable argsort instead of a
+        # full boolean scan per label
+        labels = clustering.labels_
+        order = np.argsort(labels, kind='stable')
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        groups = np.split(order, boundaries)
+
+        lat = df['latitude'].to_numpy()
+        lon = df['longitude'].to_numpy()
+        dates = df['eventdate'].to_numpy()
+
         corridors = []
-        for label in set(clustering.labels_):
-            if label == -1:  # Skip noise points
+        for group in groups:
+            if labels[group[0]] == -1:  # Skip noise points
                 continue
-                
-            cluster_points = df[clustering.labels_ == label]
+
             corridor = {
-                'points': cluster_points[['latitude', 'longitude']].values.tolist(),
-                'sighting_count': len(cluster_points),
-                'time_span': (cluster_points['eventdate'].min(), 
-                            cluster_points['eventdate'].max())
+                'points': np.column_stack((lat[group], lon[group])).tolist(),
+                'sighting_count': len(group),
+                'time_span': (dates[group].min(), dates[group].max())
             }
             corridors.append(corridor)
-            
+
         return corridors
     
     @staticmethod
-    def _haversine_distance(lat1: float, lon1: float, 
+    def _haversine_distance(lat1: float, lon1: float,
                           lat2: float, lon2: float) -> float:
         """Calculate the Haversine distance between two points."""
-        R = 6371  # Earth's radius in kilometers
-        
-        lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
-        
-        return R * c 
\ No newline at end of file
+        return _haversine_km(lat1, lon1, lat2, lon2) 
\ No newline at end of file
@@ -8,6 +8,12 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Month number (1-12) to season lookup; index 0 is unused
+_SEASON_BY_MONTH = np.array([
+    '', 'Winter', 'Winter', 'Spring', 'Spring', 'Spring',
+    'Summer', 'Summer', 'Summer', 'Autumn', 'Autumn', 'Autumn', 'Winter'
+])
+
 class WhaleDataCleaner:
     """Class for cleaning and preprocessing whale sighting data."""
     
@@ -34,21 +40,27 @@ class WhaleDataCleaner:
             logger.warning("Empty DataFrame provided")
             return df
         
-        # Create a copy to avoid modifying the original
-        df_clean = df.copy()
-        
-        # Ensure required columns exist
+        # Ensure required columns exist; assign() returns a new frame,
+        # so the caller's DataFrame is never modified and no full
+        # up-front copy is needed
+        df_clean = df
         missing_cols = [col for col in self.required_columns if col not in df_clean.columns]
         if missing_cols:
             logger.warning(f"Missing columns will be created: {missing_cols}")
-            for col in missing_cols:
-                if col == 'individualcount':
-                    df_clean[col] = 1  # Assume single individual if not specified
-                else:
-                    df_clean[col] = None
-        
-        # Convert date to datetime
-        df_clean['eventdate'] = pd.to_datetime(df_clean['eventdate'], errors='coerce')
+            # One assign (and one block allocation) for all missing
+            # columns instead of a consolidation per column; assume a
+            # single individual if the count is not specified
+            fill = {col: (1 if col == 'individualcount' else pd.NA) for col in missing_cols}
+            df_clean = df_clean.assign(**fill)
+
+        # Convert date to datetime; the explicit ISO format skips the
+        # slow inference path and cache=True reuses parses of repeated
+        # date strings
+        df_clean = df_clean.assign(
+            eventdate=pd.to_datetime(
+                df_clean['eventdate'], format='ISO8601', errors='coerce', cache=True
+            )
+        )
         
         # Handle missing values
         df_clean = self._handle_missing_values(df_clean)
@@ -76,42 +88,66 @@ class WhaleDataCleaner:
     
     def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
         """Remove duplicate records."""
-        return df.drop_duplicates(subset=['scientificname', 'latitude', 'longitude', 'eventdate'])
+        if df.empty:
+            return df
+
+        if not (pd.api.types.is_numeric_dtype(df['latitude']) and
+                pd.api.types.is_numeric_dtype(df['longitude'])):
+            # Fall back to the generic multi-column path for raw string input
+            return df.drop_duplicates(subset=['scientificname', 'latitude', 'longitude', 'eventdate'])
+
+        lat = df['latitude'].to_numpy()
+        lon = df['longitude'].to_numpy()
+
+        # Quantize coordinates to 1e-5 degrees and factorize the species
+        # and date columns, then deduplicate the four int columns
+        # together; duplicated() on a small all-integer frame is a
+        # single C-level pass and, unlike folding the keys into one
+        # int64, cannot collide distinct rows
+        latk = np.round(lat * 1e5).astype(np.int64)
+        lonk = np.round(lon * 1e5).astype(np.int64)
+        tk = pd.factorize(df['eventdate'])[0]
+        sk = pd.factorize(df['scientificname'])[0]
+
+        keys = pd.DataFrame({'sk': sk, 'latk': latk, 'lonk': lonk, 'tk': tk})
+        mask = ~keys.duplicated().to_numpy()
+
+        return df.iloc[mask]
     
     def _clean_coordinates(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and validate geographic coordinates."""
-        # Convert to numeric
-        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
-        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
-        
-        # Remove invalid coordinates
-        df = df[
-            (df['latitude'].between(-90, 90)) &
-            (df['longitude'].between(-180, 180))
-        ]
-        
-        return df
+        # Convert to numeric only when needed; coercion walks every
+        # element and reallocates even if the column is already float.
+        # The pandas-level check also handles extension dtypes
+        # (e.g. StringDtype) that numpy cannot interpret
+        for col in ['latitude', 'longitude']:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        # Remove invalid coordinates with one combined mask over the
+        # raw arrays, avoiding intermediate boolean Series
+        lat = df['latitude'].to_numpy()
+        lon = df['longitude'].to_numpy()
+        mask = (lat >= -90) & (lat <= 90) & (lon >= -180) & (lon <= 180)
+
+        return df.iloc[mask]
     
     def _add_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add derived features to the dataset."""
-        # Extract temporal features
-        df['year'] = df['eventdate'].dt.year
-        df['month'] = df['eventdate'].dt.month
-        df['season'] = df['month'].apply(self._get_season)
+        # Extract temporal features in one pass over the datetime column;
+        # the small integer dtypes cut memory bandwidth in later groupbys
+        dt = df['eventdate'].dt
+        df['year'] = dt.year.astype('int16')
+        df['month'] = dt.month.astype('int8')
+        df['season'] = _SEASON_BY_MONTH[df['month'].to_numpy()]
         
         # Add hemisphere information
         df['hemisphere'] = np.where(df['latitude'] >= 0, 'Northern', 'Southern')
-        
-        return df
-    
-    @staticmethod
-    def _get_season(month: int) -> str:
-        """Convert month to season."""
-        if month in [12, 1, 2]:
-            return 'Winter'
-        elif month in [3, 4, 5]:
-            return 'Spring'
-        elif month in [6, 7, 8]:
-            return 'Summer'
-        else:
-            return 'Autumn' 
\ No newline at end of file
+
+        # Encode low-cardinality string columns as categoricals so
+        # downstream filtering and groupby compare integer codes
+        # instead of Python strings
+        for col in ['scientificname', 'season', 'hemisphere']:
+            df[col] = df[col].astype('category')
+
+        return df 
\ No newline at end of file
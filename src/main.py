@@ -1,4 +1,5 @@
 import pandas as pd
+import plotly.io as pio
 from datetime import datetime, timedelta
 import logging
 from pathlib import Path
@@ -38,9 +39,10 @@ def main():
         logger.error("No data retrieved from API")
         return
     
-    # Save raw data
-    raw_data_path = data_dir / 'raw_whale_data.csv'
-    raw_data.to_csv(raw_data_path, index=False)
+    # Save raw data; Parquet round-trips dtypes (datetime64, category)
+    # and is much smaller and faster than CSV text serialization
+    raw_data_path = data_dir / 'raw_whale_data.parquet'
+    raw_data.to_parquet(raw_data_path, compression='snappy')
     logger.info(f"Raw data saved to {raw_data_path}")
     
     # Clean data
@@ -52,8 +54,8 @@ def main():
         return
     
     # Save cleaned data
-    cleaned_data_path = data_dir / 'cleaned_whale_data.csv'
-    cleaned_data.to_csv(cleaned_data_path, index=False)
+    cleaned_data_path = data_dir / 'cleaned_whale_data.parquet'
+    cleaned_data.to_parquet(cleaned_data_path, compression='snappy')
     logger.info(f"Cleaned data saved to {cleaned_data_path}")
     
     # Initialize analyzers
@@ -84,9 +86,9 @@ def main():
         show_tracks=True
     )
     
-    # Save map
+    # Save map (create_interactive_map returns a plain figure dict)
     map_path = data_dir / 'whale_sightings_map.html'
-    map_fig.save(str(map_path))
+    pio.write_html(map_fig, str(map_path))
     logger.info(f"Map saved to {map_path}")
     
     # Create temporal plot
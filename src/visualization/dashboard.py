@@ -1,203 +1,277 @@
-import dash
-from dash import dcc, html
-from dash.dependencies import Input, Output, State
-import plotly.graph_objects as go
-import pandas as pd
-from datetime import datetime, timedelta
-import logging
-from pathlib import Path
-
-from utils.api_utils import OBISSEAMAPClient
-from data_acquisition.clean_data import WhaleDataCleaner
-from analysis.habitat_analysis import WhaleHabitatAnalyzer
-from visualization.map_visualizer import WhaleMapVisualizer
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Initialize the API client with sample data
-api_client = OBISSEAMAPClient(use_sample_data=True)
-
-# Initialize Dash app
-app = dash.Dash(__name__, title='Whale Watch Dashboard')
-
-# Get initial species list
-species_list = api_client.get_species_list()
-species_options = [
-    {'label': f"{species['common_name']} ({species['scientific_name']})", 
-     'value': species['scientific_name']} 
-    for species in species_list
-]
-
-# Define the layout
-app.layout = html.Div([
-    html.H1('Whale Watch: Habitat Preferences and Migration Patterns', 
-            style={'textAlign': 'center', 'marginBottom': '20px'}),
-    
-    # Controls section
-    html.Div([
-        html.Div([
-            html.Label('Select Species:'),
-            dcc.Dropdown(
-                id='species-dropdown',
-                options=species_options,
-                value=species_options[0]['value'] if species_options else None,
-                multi=False,
-                style={'width': '100%', 'minWidth': '300px'},
-                clearable=False
-            ),
-        ], style={'width': '30%', 'display': 'inline-block', 'padding': '10px'}),
-        
-        html.Div([
-            html.Label('Date Range:'),
-            dcc.DatePickerRange(
-                id='date-range',
-                min_date_allowed=datetime(2000, 1, 1),
-                max_date_allowed=datetime.now(),
-                start_date=datetime(2010, 1, 1),
-                end_date=datetime(2020, 12, 31),
-                style={'width': '100%'}
-            ),
-        ], style={'width': '40%', 'display': 'inline-block', 'padding': '10px'}),
-        
-        html.Div([
-            html.Label('Analysis Type:'),
-            dcc.RadioItems(
-                id='analysis-type',
-                options=[
-                    {'label': 'Habitat Preferences', 'value': 'habitat'},
-                    {'label': 'Migration Patterns', 'value': 'migration'}
-                ],
-                value='habitat',
-                style={'marginTop': '10px'}
-            ),
-        ], style={'width': '30%', 'display': 'inline-block', 'padding': '10px'}),
-    ], style={'border': '1px solid #ddd', 'padding': '20px', 'margin': '10px', 'borderRadius': '5px'}),
-    
-    # Loading state
-    dcc.Loading(
-        id="loading",
-        type="circle",
-        children=[
-            # Main content area
-            html.Div([
-                # Map visualization
-                html.Div([
-                    html.H3('Whale Sightings Map', style={'textAlign': 'center'}),
-                    dcc.Graph(id='whale-map')
-                ], style={'width': '60%', 'display': 'inline-block', 'padding': '10px'}),
-                
-                # Analysis results
-                html.Div([
-                    html.H3('Analysis Results', style={'textAlign': 'center'}),
-                    html.Div(id='analysis-results')
-                ], style={'width': '35%', 'display': 'inline-block', 'padding': '10px', 'verticalAlign': 'top'}),
-            ]),
-            
-            # Temporal analysis
-            html.Div([
-                html.H3('Temporal Analysis', style={'textAlign': 'center'}),
-                dcc.Graph(id='temporal-plot')
-            ], style={'padding': '20px', 'margin': '10px', 'border': '1px solid #ddd', 'borderRadius': '5px'}),
-            
-            # Habitat preferences
-            html.Div([
-                html.H3('Habitat Preferences', style={'textAlign': 'center'}),
-                dcc.Graph(id='habitat-plot')
-            ], style={'padding': '20px', 'margin': '10px', 'border': '1px solid #ddd', 'borderRadius': '5px'}),
-        ]
-    ),
-    
-    # Error message area
-    html.Div(id='error-message', style={'color': 'red', 'margin': '10px', 'textAlign': 'center'})
-])
-
-@app.callback(
-    [Output('whale-map', 'figure'),
-     Output('analysis-results', 'children'),
-     Output('temporal-plot', 'figure'),
-     Output('habitat-plot', 'figure'),
-     Output('error-message', 'children')],
-    [Input('species-dropdown', 'value'),
-     Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('analysis-type', 'value')]
-)
-def update_visualizations(species, start_date, end_date, analysis_type):
-    if not species:
-        return {}, html.Div("Please select a species"), {}, {}, "No species selected"
-    
-    try:
-        # Fetch and process data
-        date_range = {
-            'start': start_date,
-            'end': end_date
-        }
-        
-        logger.info(f"Fetching data for {species} from {start_date} to {end_date}")
-        raw_data = api_client.fetch_whale_data(
-            species=[species],
-            date_range=date_range
-        )
-        
-        if raw_data.empty:
-            return {}, html.Div("No data available"), {}, {}, "No data available for the selected criteria"
-        
-        # Clean data
-        data_cleaner = WhaleDataCleaner()
-        cleaned_data = data_cleaner.clean_data(raw_data)
-        
-        if cleaned_data.empty:
-            return {}, html.Div("No valid data after cleaning"), {}, {}, "No valid data after cleaning"
-        
-        # Initialize analyzers
-        habitat_analyzer = WhaleHabitatAnalyzer(cleaned_data)
-        map_visualizer = WhaleMapVisualizer(cleaned_data)
-        
-        # Create visualizations
-        map_fig = map_visualizer.create_interactive_map(
-            species=species,
-            time_range=date_range,
-            show_heatmap=True,
-            show_tracks=(analysis_type == 'migration')
-        )
-        
-        temporal_fig = map_visualizer.create_temporal_plot(
-            species=species,
-            time_period='month'
-        )
-        
-        habitat_fig = map_visualizer.create_habitat_preference_plot(
-            species=species,
-            time_period='season'
-        )
-        
-        # Generate analysis results
-        if analysis_type == 'habitat':
-            metrics = habitat_analyzer.analyze_habitat_preferences(
-                species=species,
-                time_period='season'
-            )
-            results = html.Div([
-                html.H4('Habitat Analysis Results'),
-                html.P(f"Total sightings: {metrics.get('total_sightings', 0)}"),
-                html.P(f"Unique locations: {metrics.get('unique_locations', 0)}"),
-                html.P(f"Hotspot count: {metrics.get('hotspot_count', 0)}")
-            ])
-        else:
-            metrics = habitat_analyzer.analyze_migration_patterns(species)
-            results = html.Div([
-                html.H4('Migration Analysis Results'),
-                html.P(f"Total migration distance: {metrics.get('total_distance', 0):.2f} km"),
-                html.P(f"Number of migration corridors: {len(metrics.get('migration_corridors', []))}")
-            ])
-        
-        return map_fig, results, temporal_fig, habitat_fig, ""
-        
-    except Exception as e:
-        logger.error(f"Error updating visualizations: {e}")
-        return {}, html.Div("Error processing data"), {}, {}, f"Error: {str(e)}"
-
-if __name__ == '__main__':
+import dash
+from dash import dcc, html
+from dash.dependencies import Input, Output, State
+from flask_caching import Cache
+import plotly.graph_objects as go
+import plotly.io as pio
+import pandas as pd
+import functools
+from datetime import datetime, timedelta
+import logging
+from pathlib import Path
+
+from utils.api_utils import OBISSEAMAPClient
+from data_acquisition.clean_data import WhaleDataCleaner
+from analysis.habitat_analysis import WhaleHabitatAnalyzer
+from visualization.map_visualizer import WhaleMapVisualizer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Serialize figures with orjson when available; the default encoder is
+# a measurable chunk of callback latency for large map traces
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+# Initialize the API client with sample data
+api_client = OBISSEAMAPClient(use_sample_data=True)
+
+# The cleaner is stateless, so one instance serves every callback
+data_cleaner = WhaleDataCleaner()
+
+# Initialize Dash app
+app = dash.Dash(__name__, title='Whale Watch Dashboard')
+
+# Memoize the expensive fetch/clean/plot pipeline per input tuple so
+# repeated selections (e.g. toggling analysis type back and forth)
+# return instantly instead of recomputing everything
+cache = Cache(app.server, config={
+    'CACHE_TYPE': 'SimpleCache',
+    'CACHE_DEFAULT_TIMEOUT': 600
+})
+
+@functools.lru_cache(maxsize=1)
+def _species_options():
+    """Build the species dropdown options once, on first use."""
+    return [
+        {'label': f"{species['common_name']} ({species['scientific_name']})",
+         'value': species['scientific_name']}
+        for species in api_client.get_species_list()
+    ]
+
+
+# Define the layout as a function so the species list is fetched on the
+# first page load (and cached) instead of blocking app import
+def serve_layout():
+    species_options = _species_options()
+    return html.Div([
+    html.H1('Whale Watch: Habitat Preferences and Migration Patterns', 
+            style={'textAlign': 'center', 'marginBottom': '20px'}),
+    
+    # Controls section
+    html.Div([
+        html.Div([
+            html.Label('Select Species:'),
+            dcc.Dropdown(
+                id='species-dropdown',
+                options=species_options,
+                value=species_options[0]['value'] if species_options else None,
+                multi=False,
+                style={'width': '100%', 'minWidth': '300px'},
+                clearable=False
+            ),
+        ], style={'width': '30%', 'display': 'inline-block', 'padding': '10px'}),
+        
+        html.Div([
+            html.Label('Date Range:'),
+            dcc.DatePickerRange(
+                id='date-range',
+                min_date_allowed=datetime(2000, 1, 1),
+                max_date_allowed=datetime.now(),
+                start_date=datetime(2010, 1, 1),
+                end_date=datetime(2020, 12, 31),
+                style={'width': '100%'}
+            ),
+        ], style={'width': '40%', 'display': 'inline-block', 'padding': '10px'}),
+        
+        html.Div([
+            html.Label('Analysis Type:'),
+            dcc.RadioItems(
+                id='analysis-type',
+                options=[
+                    {'label': 'Habitat Preferences', 'value': 'habitat'},
+                    {'label': 'Migration Patterns', 'value': 'migration'}
+                ],
+                value='habitat',
+                style={'marginTop': '10px'}
+            ),
+        ], style={'width': '30%', 'display': 'inline-block', 'padding': '10px'}),
+    ], style={'border': '1px solid #ddd', 'padding': '20px', 'margin': '10px', 'borderRadius': '5px'}),
+    
+    # Loading state
+    dcc.Loading(
+        id="loading",
+        type="circle",
+        children=[
+            # Main content area
+            html.Div([
+                # Map visualization
+                html.Div([
+                    html.H3('Whale Sightings Map', style={'textAlign': 'center'}),
+                    dcc.Graph(id='whale-map')
+                ], style={'width': '60%', 'display': 'inline-block', 'padding': '10px'}),
+                
+                # Analysis results
+                html.Div([
+                    html.H3('Analysis Results', style={'textAlign': 'center'}),
+                    html.Div(id='analysis-results')
+                ], style={'width': '35%', 'display': 'inline-block', 'padding': '10px', 'verticalAlign': 'top'}),
+            ]),
+            
+            # Temporal analysis
+            html.Div([
+                html.H3('Temporal Analysis', style={'textAlign': 'center'}),
+                dcc.Graph(id='temporal-plot')
+            ], style={'padding': '20px', 'margin': '10px', 'border': '1px solid #ddd', 'borderRadius': '5px'}),
+            
+            # Habitat preferences
+            html.Div([
+                html.H3('Habitat Preferences', style={'textAlign': 'center'}),
+                dcc.Graph(id='habitat-plot')
+            ], style={'padding': '20px', 'margin': '10px', 'border': '1px solid #ddd', 'borderRadius': '5px'}),
+        ]
+    ),
+    
+    # Error message area
+    html.Div(id='error-message', style={'color': 'red', 'margin': '10px', 'textAlign': 'center'})
+    ])
+
+
+app.layout = serve_layout
+
+@app.callback(
+    [Output('whale-map', 'figure'),
+     Output('analysis-results', 'children'),
+     Output('temporal-plot', 'figure'),
+     Output('habitat-plot', 'figure'),
+     Output('error-message', 'children')],
+    [Input('species-dropdown', 'value'),
+     Input('date-range', 'start_date'),
+     Input('date-range', 'end_date'),
+     Input('analysis-type', 'value')]
+)
+def update_visualizations(species, start_date, end_date, analysis_type):
+    if not species:
+        return {}, html.Div("Please select a species"), {}, {}, "No species selected"
+
+    try:
+        return _compute_visualizations(species, start_date, end_date, analysis_type)
+    except Exception as e:
+        logger.error(f"Error updating visualizations: {e}")
+        return {}, html.Div("Error processing data"), {}, {}, f"Error: {str(e)}"
+
+
+@cache.memoize(timeout=1800)
+def _fetch_data(species, start_date, end_date):
+    """Fetch raw sightings for one species and date window."""
+    return api_client.fetch_whale_data(
+        species=[species],
+        date_range={'start': start_date, 'end': end_date}
+    )
+
+
+@cache.memoize(timeout=1800)
+def _clean_data(species, start_date, end_date):
+    """Clean the raw sightings for one species and date window."""
+    return data_cleaner.clean_data(_fetch_data(species, start_date, end_date))
+
+
+@functools.lru_cache(maxsize=32)
+def _analyzer_for(species, start_date, end_date):
+    """Build (and cache) a habitat analyzer for one cleaned-data key."""
+    return WhaleHabitatAnalyzer(_clean_data(species, start_date, end_date))
+
+
+@functools.lru_cache(maxsize=32)
+def _visualizer_for(species, start_date, end_date):
+    """
+    Build (and cache) a map visualizer for one cleaned-data key.
+
+    Construction runs validation and precomputes the per-species array
+    views, so reusing instances amortizes that work across callbacks
+    that only toggle the analysis type or re-select the same window.
+    """
+    return WhaleMapVisualizer(_clean_data(species, start_date, end_date))
+
+
+@cache.memoize()
+def _compute_visualizations(species, start_date, end_date, analysis_type):
+    """
+    Fetch, clean, analyze and build all figures for one input tuple.
+
+    Figures are returned as JSON-ready dicts so cache hits also skip
+    Plotly serialization.
+    """
+    # The memoized helpers mean toggling the analysis type for an
+    # unchanged species/date window skips the heavy fetch and clean
+    # stages entirely
+    logger.info(f"Fetching data for {species} from {start_date} to {end_date}")
+    raw_data = _fetch_data(species, start_date, end_date)
+
+    date_range = {
+        'start': start_date,
+        'end': end_date
+    }
+
+    if raw_data.empty:
+        return {}, html.Div("No data available"), {}, {}, "No data available for the selected criteria"
+
+    cleaned_data = _clean_data(species, start_date, end_date)
+
+    if cleaned_data.empty:
+        return {}, html.Div("No valid data after cleaning"), {}, {}, "No valid data after cleaning"
+
+    # Reuse cached analyzer/visualizer instances; they share the same
+    # key as the cleaned-data cache, so a repeat window skips both the
+    # clean stage and the per-species view construction
+    habitat_analyzer = _analyzer_for(species, start_date, end_date)
+    map_visualizer = _visualizer_for(species, start_date, end_date)
+
+    # Create visualizations
+    map_fig = map_visualizer.create_interactive_map(
+        species=species,
+        time_range=date_range,
+        show_heatmap=True,
+        show_tracks=(analysis_type == 'migration')
+    )
+
+    temporal_fig = map_visualizer.create_temporal_plot(
+        species=species,
+        time_period='month'
+    )
+
+    habitat_fig = map_visualizer.create_habitat_preference_plot(
+        species=species,
+        time_period='season'
+    )
+
+    # Generate analysis results
+    if analysis_type == 'habitat':
+        metrics = habitat_analyzer.analyze_habitat_preferences(
+            species=species,
+            time_period='season'
+        )
+        results = html.Div([
+            html.H4('Habitat Analysis Results'),
+            html.P(f"Total sightings: {metrics.get('total_sightings', 0)}"),
+            html.P(f"Unique locations: {metrics.get('unique_locations', 0)}"),
+            html.P(f"Hotspot count: {metrics.get('hotspot_count', 0)}")
+        ])
+    else:
+        metrics = habitat_analyzer.analyze_migration_patterns(species)
+        results = html.Div([
+            html.H4('Migration Analysis Results'),
+            html.P(f"Total migration distance: {metrics.get('total_distance', 0):.2f} km"),
+            html.P(f"Number of migration corridors: {len(metrics.get('migration_corridors', []))}")
+        ])
+
+    # map_fig is already a plain dict; hand the remaining figures over
+    # as JSON-ready dicts so the memoized value skips Figure rebuilds
+    return map_fig, results, temporal_fig.to_plotly_json(), habitat_fig.to_plotly_json(), ""
+
+if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -1,282 +1,482 @@
-import pandas as pd
-import numpy as np
-from typing import Dict, List, Optional
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
-import logging
-from scipy import stats
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-class WhaleMapVisualizer:
-    """Class for creating interactive visualizations of whale data."""
-    
-    # Define India's bounding box
-    INDIA_BBOX = {
-        'min_lat': 6.5,   # Southern tip of India
-        'max_lat': 35.5,  # Northern boundary including Kashmir
-        'min_lon': 68.0,  # Western boundary
-        'max_lon': 97.5   # Eastern boundary including Andaman & Nicobar
-    }
-    
-    def __init__(self, df: pd.DataFrame):
-        self.df = df
-        self._validate_data()
-    
-    def _validate_data(self):
-        """Validate the input data."""
-        required_columns = ['scientificname', 'latitude', 'longitude', 'eventdate']
-        missing_cols = [col for col in required_columns if col not in self.df.columns]
-        if missing_cols:
-            raise ValueError(f"Missing required columns: {missing_cols}")
-    
-    def create_interactive_map(self,
-                             species: Optional[str] = None,
-                             time_range: Optional[Dict[str, datetime]] = None,
-                             show_heatmap: bool = True,
-                             show_tracks: bool = True) -> go.Figure:
-        """
-        Create an interactive map showing whale sightings and migration patterns.
-        
-        Args:
-            species: Filter by specific species
-            time_range: Dictionary with 'start' and 'end' dates
-            show_heatmap: Whether to show density heatmap
-            show_tracks: Whether to show migration tracks
-            
-        Returns:
-            plotly.graph_objects.Figure
-        """
-        # Filter data based on parameters
-        df_filtered = self._filter_data(species, time_range)
-        
-        if df_filtered.empty:
-            # Return empty figure if no data
-            return go.Figure()
-        
-        # Create base map
-        fig = go.Figure()
-        
-        # Split data into Indian region and rest of the world
-        df_india = df_filtered[
-            (df_filtered['latitude'].between(self.INDIA_BBOX['min_lat'], self.INDIA_BBOX['max_lat'])) &
-            (df_filtered['longitude'].between(self.INDIA_BBOX['min_lon'], self.INDIA_BBOX['max_lon']))
-        ]
-        df_world = df_filtered[~df_filtered.index.isin(df_india.index)]
-        
-        # Add Indian region sightings with different color
-        if not df_india.empty:
-            fig.add_trace(go.Scattermapbox(
-                lon=df_india['longitude'],
-                lat=df_india['latitude'],
-                mode='markers',
-                marker=dict(
-                    size=10,
-                    opacity=0.8,
-                    color='red'  # Highlight Indian region sightings
-                ),
-                text=[
-                    f"Species: {row['scientificname']}<br>"
-                    f"Date: {row['eventdate'].strftime('%Y-%m-%d')}<br>"
-                    f"Count: {row.get('individualcount', 1)}<br>"
-                    f"Region: Indian Waters"
-                    for _, row in df_india.iterrows()
-                ],
-                hoverinfo='text',
-                name='Sightings (Indian Waters)'
-            ))
-        
-        # Add rest of world sightings
-        if not df_world.empty:
-            fig.add_trace(go.Scattermapbox(
-                lon=df_world['longitude'],
-                lat=df_world['latitude'],
-                mode='markers',
-                marker=dict(
-                    size=8,
-                    opacity=0.6,
-                    color='blue'
-                ),
-                text=[
-                    f"Species: {row['scientificname']}<br>"
-                    f"Date: {row['eventdate'].strftime('%Y-%m-%d')}<br>"
-                    f"Count: {row.get('individualcount', 1)}<br>"
-                    f"Region: International Waters"
-                    for _, row in df_world.iterrows()
-                ],
-                hoverinfo='text',
-                name='Sightings (International Waters)'
-            ))
-        
-        # Add migration tracks if requested
-        if show_tracks:
-            for _, group in df_filtered.groupby('scientificname'):
-                group = group.sort_values('eventdate')
-                fig.add_trace(go.Scattermapbox(
-                    lon=group['longitude'],
-                    lat=group['latitude'],
-                    mode='lines',
-                    line=dict(
-                        width=2,
-                        color='rgba(255, 165, 0, 0.6)'  # Semi-transparent orange
-                    ),
-                    name='Migration Track'
-                ))
-        
-        # Add density heatmap if requested
-        if show_heatmap and len(df_filtered) > 1:
-            fig.add_trace(go.Densitymapbox(
-                lat=df_filtered['latitude'],
-                lon=df_filtered['longitude'],
-                z=df_filtered['individualcount'],
-                radius=30,
-                colorscale='Viridis',
-                name='Density',
-                opacity=0.5
-            ))
-        
-        # Center map on India by default
-        center_lat = (self.INDIA_BBOX['min_lat'] + self.INDIA_BBOX['max_lat']) / 2
-        center_lon = (self.INDIA_BBOX['min_lon'] + self.INDIA_BBOX['max_lon']) / 2
-        
-        # Update layout with Mapbox
-        fig.update_layout(
-            title=f'Whale Sightings Map - {species if species else "All Species"}',
-            mapbox=dict(
-                style='carto-positron',  # Light map style
-                center=dict(lat=center_lat, lon=center_lon),
-                zoom=4  # Closer zoom to show Indian region in detail
-            ),
-            showlegend=True,
-            margin=dict(l=0, r=0, t=30, b=0),
-            width=800,
-            height=600
-        )
-        
-        return fig
-    
-    def _filter_data(self,
-                    species: Optional[str],
-                    time_range: Optional[Dict[str, datetime]]) -> pd.DataFrame:
-        """Filter data based on species and time range."""
-        df_filtered = self.df.copy()
-        
-        if species:
-            df_filtered = df_filtered[df_filtered['scientificname'] == species]
-        
-        if time_range:
-            df_filtered = df_filtered[
-                (df_filtered['eventdate'] >= time_range['start']) &
-                (df_filtered['eventdate'] <= time_range['end'])
-            ]
-        
-        return df_filtered
-    
-    def create_temporal_plot(self,
-                           species: Optional[str] = None,
-                           time_period: str = 'month') -> go.Figure:
-        """
-        Create a temporal plot of whale sightings.
-        
-        Args:
-            species: Filter by specific species
-            time_period: Time period for aggregation ('month' or 'year')
-            
-        Returns:
-            plotly.graph_objects.Figure
-        """
-        # Filter data
-        df_filtered = self._filter_data(species, None)
-        
-        # Group by time period
-        if time_period == 'month':
-            df_grouped = df_filtered.groupby(['year', 'month']).size().reset_index(name='count')
-            df_grouped['date'] = pd.to_datetime(
-                df_grouped[['year', 'month']].assign(day=1)
-            )
-        else:
-            df_grouped = df_filtered.groupby('year').size().reset_index(name='count')
-            df_grouped['date'] = pd.to_datetime(df_grouped['year'], format='%Y')
-        
-        # Create plot
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df_grouped['date'],
-            y=df_grouped['count'],
-            mode='lines+markers',
-            name='Sightings'
-        ))
-        
-        # Update layout
-        fig.update_layout(
-            title='Temporal Distribution of Whale Sightings',
-            xaxis_title='Date',
-            yaxis_title='Number of Sightings',
-            hovermode='x unified'
-        )
-        
-        return fig
-    
-    def create_habitat_preference_plot(self,
-                                     species: str,
-                                     time_period: str = 'season') -> go.Figure:
-        """
-        Create a plot showing habitat preferences by season or year.
-        
-        Args:
-            species: Species to analyze
-            time_period: Time period for grouping ('season' or 'year')
-            
-        Returns:
-            plotly.graph_objects.Figure
-        """
-        # Filter data for species
-        df_species = self.df[self.df['scientificname'] == species].copy()
-        
-        # Group by time period and calculate statistics
-        df_grouped = df_species.groupby(time_period).agg({
-            'latitude': ['mean', 'std'],
-            'longitude': ['mean', 'std']
-        }).reset_index()
-        
-        # Create plot
-        fig = go.Figure()
-        
-        # Add error bars for latitude
-        fig.add_trace(go.Scatter(
-            x=df_grouped[time_period],
-            y=df_grouped[('latitude', 'mean')],
-            error_y=dict(
-                type='data',
-                array=df_grouped[('latitude', 'std')],
-                visible=True
-            ),
-            name='Latitude',
-            mode='lines+markers'
-        ))
-        
-        # Add error bars for longitude
-        fig.add_trace(go.Scatter(
-            x=df_grouped[time_period],
-            y=df_grouped[('longitude', 'mean')],
-            error_y=dict(
-                type='data',
-                array=df_grouped[('longitude', 'std')],
-                visible=True
-            ),
-            name='Longitude',
-            mode='lines+markers'
-        ))
-        
-        # Update layout
-        fig.update_layout(
-            title=f'Habitat Preferences for {species} by {time_period}',
-            xaxis_title=time_period.capitalize(),
-            yaxis_title='Coordinates',
-            hovermode='x unified'
-        )
-        
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+import plotly.express as px
+import plotly.graph_objects as go
+from datetime import datetime
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class WhaleMapVisualizer:
+    """Class for creating interactive visualizations of whale data."""
+    
+    # Define India's bounding box
+    INDIA_BBOX = {
+        'min_lat': 6.5,   # Southern tip of India
+        'max_lat': 35.5,  # Northern boundary including Kashmir
+        'min_lon': 68.0,  # Western boundary
+        'max_lon': 97.5   # Eastern boundary including Andaman & Nicobar
+    }
+
+    # Above this many sightings, markers are sampled down to this cap,
+    # migration tracks are strided, and the density layer is fed
+    # pre-binned grid cells instead of raw points
+    MAX_RAW_RENDER_POINTS = 5000
+
+    # Static map layout shared by every build (centered on India);
+    # only the title varies per call, so the browser can diff-apply
+    # updates instead of re-laying-out the whole figure
+    BASE_MAP_LAYOUT = {
+        'mapbox': {
+            'style': 'carto-positron',  # Light map style
+            'center': {
+                'lat': (INDIA_BBOX['min_lat'] + INDIA_BBOX['max_lat']) / 2,
+                'lon': (INDIA_BBOX['min_lon'] + INDIA_BBOX['max_lon']) / 2
+            },
+            'zoom': 4  # Closer zoom to show Indian region in detail
+        },
+        'showlegend': True,
+        'margin': {'l': 0, 'r': 0, 't': 30, 'b': 0},
+        'width': 800,
+        'height': 600
+    }
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._validate_data()
+        # Guarantee a clean individualcount column up front so the hover
+        # text, heatmap weights and per-species views can read it
+        # directly without per-call existence checks or NaN handling
+        if 'individualcount' not in self.df.columns:
+            self.df = self.df.assign(individualcount=np.int32(1))
+        else:
+            self.df = self.df.assign(
+                individualcount=self.df['individualcount'].fillna(1).astype(np.int32)
+            )
+        # Categorical species/season let repeated filters and groupbys
+        # compare integer codes; no-op when the cleaner already cast them
+        cast = {
+            col: self.df[col].astype('category')
+            for col in ('scientificname', 'season')
+            if col in self.df.columns and self.df[col].dtype != 'category'
+        }
+        if cast:
+            self.df = self.df.assign(**cast)
+        # Format hover dates once for the whole frame; strftime on every
+        # plot call was the remaining per-row Python cost in the hover
+        # path (the views below keep epoch ints for range filtering)
+        if 'date_str' not in self.df.columns:
+            self.df = self.df.assign(
+                date_str=self.df['eventdate'].dt.strftime('%Y-%m-%d')
+            )
+        # Evaluate the India bounding box once for the whole frame; the
+        # per-species views and marker samples inherit the column, so a
+        # map render only reads and negates it instead of re-running
+        # four comparisons per call
+        bbox = self.INDIA_BBOX
+        self.df = self.df.assign(
+            in_india=(
+                self.df['latitude'].between(bbox['min_lat'], bbox['max_lat']) &
+                self.df['longitude'].between(bbox['min_lon'], bbox['max_lon'])
+            )
+        )
+        self._build_species_views()
+
+    def _build_species_views(self):
+        """
+        Precompute per-species views sorted by date.
+
+        The DataFrame slice keeps hover text and groupbys cheap, while
+        the parallel arrays (float32 coordinates, int64 epoch
+        nanoseconds, int32 counts) let time-range filtering run as a
+        binary search on the epoch array instead of a full-column scan
+        on every plot call.
+        """
+        self._by_species = {}
+        df_sorted = self.df.sort_values('eventdate')
+        for sp, group in df_sorted.groupby('scientificname', observed=True, sort=False):
+            self._by_species[sp] = {
+                'frame': group,
+                'lat': group['latitude'].to_numpy(np.float32),
+                'lon': group['longitude'].to_numpy(np.float32),
+                't': group['eventdate'].to_numpy(dtype='datetime64[ns]').astype('int64'),
+                'cnt': group['individualcount'].to_numpy(np.int32)
+            }
+
+    def _filter_arrays(self,
+                      species: str,
+                      time_range: Optional[Dict[str, datetime]]) -> Optional[Dict]:
+        """
+        Return the cached date-sorted view for a species, cut to a time
+        range by binary search. Returns None for unknown species.
+        """
+        view = self._by_species.get(species)
+        if view is None or not time_range:
+            return view
+
+        t = view['t']
+        start_ns = pd.Timestamp(time_range['start']).value
+        end_ns = pd.Timestamp(time_range['end']).value
+        lo = np.searchsorted(t, start_ns, side='left')
+        hi = np.searchsorted(t, end_ns, side='right')
+
+        return {
+            'frame': view['frame'].iloc[lo:hi],
+            'lat': view['lat'][lo:hi],
+            'lon': view['lon'][lo:hi],
+            't': t[lo:hi],
+            'cnt': view['cnt'][lo:hi]
+        }
+
+    def _validate_data(self):
+        """Validate the input data."""
+        required_columns = ['scientificname', 'latitude', 'longitude', 'eventdate']
+        missing_cols = [col for col in required_columns if col not in self.df.columns]
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+
+    @staticmethod
+    def _round_coords(values, ndp: int = 5) -> np.ndarray:
+        """
+        Round coordinates to ndp decimals (~1 m at 5) as compact float32.
+
+        Extra precision is invisible on the map but inflates the JSON
+        payload and the browser's parse time.
+        """
+        return np.round(np.asarray(values, dtype=np.float32), ndp)
+
+    @staticmethod
+    def _hover_text(df: pd.DataFrame, region: str) -> np.ndarray:
+        """
+        Build hover labels with vectorized string concatenation instead
+        of a per-row iterrows loop.
+        """
+        if 'date_str' in df.columns:
+            date_str = df['date_str']
+        else:
+            date_str = df['eventdate'].dt.strftime('%Y-%m-%d')
+        counts = df['individualcount'].astype(str)
+
+        text = (
+            "Species: " + df['scientificname'].astype(str) +
+            "<br>Date: " + date_str +
+            "<br>Count: " + counts +
+            "<br>Region: " + region
+        )
+        return text.to_numpy()
+
+    def create_interactive_map(self,
+                             species: Optional[str] = None,
+                             time_range: Optional[Dict[str, datetime]] = None,
+                             show_heatmap: bool = True,
+                             show_tracks: bool = True) -> Dict:
+        """
+        Create an interactive map showing whale sightings and migration patterns.
+
+        Args:
+            species: Filter by specific species
+            time_range: Dictionary with 'start' and 'end' dates
+            show_heatmap: Whether to show density heatmap
+            show_tracks: Whether to show migration tracks
+
+        Returns:
+            Plain figure dict ({'data': ..., 'layout': ...}); Dash and
+            plotly.io consume it directly, the shared layout is not
+            rebuilt per call, and the browser applies it via
+            Plotly.react diffing rather than a full redraw
+        """
+        # Filter data based on parameters; the cached per-species view
+        # turns the time filter into a binary search
+        if species:
+            view = self._filter_arrays(species, time_range)
+            df_filtered = view['frame'] if view is not None else self.df.iloc[0:0]
+        else:
+            df_filtered = self._filter_data(species, time_range)
+
+        if df_filtered.empty:
+            # Return empty figure if no data
+            return {'data': [], 'layout': dict(self.BASE_MAP_LAYOUT)}
+
+        # Collect traces for the figure dict
+        traces = []
+
+        # Decimate the marker layer for very large datasets; Plotly
+        # renders one marker per row, so rendering cost must be capped
+        # independently of the sighting count
+        df_markers = df_filtered
+        if len(df_filtered) > self.MAX_RAW_RENDER_POINTS:
+            df_markers = df_filtered.sample(
+                n=self.MAX_RAW_RENDER_POINTS, random_state=0
+            )
+
+        # Split data into Indian region and rest of the world using the
+        # membership column precomputed at construction
+        in_india = df_markers['in_india'].to_numpy()
+        df_india = df_markers[in_india]
+        df_world = df_markers[~in_india]
+        
+        # Add Indian region sightings with different color
+        if not df_india.empty:
+            traces.append(go.Scattermapbox(
+                lon=self._round_coords(df_india['longitude']),
+                lat=self._round_coords(df_india['latitude']),
+                mode='markers',
+                marker=dict(
+                    size=10,
+                    opacity=0.8,
+                    color='red'  # Highlight Indian region sightings
+                ),
+                text=self._hover_text(df_india, 'Indian Waters'),
+                hoverinfo='text',
+                name='Sightings (Indian Waters)'
+            ))
+        
+        # Add rest of world sightings
+        if not df_world.empty:
+            traces.append(go.Scattermapbox(
+                lon=self._round_coords(df_world['longitude']),
+                lat=self._round_coords(df_world['latitude']),
+                mode='markers',
+                marker=dict(
+                    size=8,
+                    opacity=0.6,
+                    color='blue'
+                ),
+                text=self._hover_text(df_world, 'International Waters'),
+                hoverinfo='text',
+                name='Sightings (International Waters)'
+            ))
+        
+        # Add migration tracks if requested
+        if show_tracks:
+            # One sort covers every species, and the per-species
+            # polylines are merged into a single trace with NaN breaks
+            # so the client renders one line object instead of one per
+            # group
+            df_sorted = df_filtered.sort_values(['scientificname', 'eventdate'])
+            # Stride the sorted points so the polyline payload is capped
+            # like the marker layer; striding (rather than random
+            # sampling) keeps the date ordering and track shape
+            if len(df_sorted) > self.MAX_RAW_RENDER_POINTS:
+                stride = int(np.ceil(len(df_sorted) / self.MAX_RAW_RENDER_POINTS))
+                df_sorted = df_sorted.iloc[::stride]
+            codes = pd.factorize(df_sorted['scientificname'])[0]
+            boundaries = np.flatnonzero(np.diff(codes)) + 1
+
+            traces.append(go.Scattermapbox(
+                lon=np.insert(self._round_coords(df_sorted['longitude']), boundaries, np.nan),
+                lat=np.insert(self._round_coords(df_sorted['latitude']), boundaries, np.nan),
+                mode='lines',
+                connectgaps=False,
+                line=dict(
+                    width=2,
+                    color='rgba(255, 165, 0, 0.6)'  # Semi-transparent orange
+                ),
+                name='Migration Track'
+            ))
+        
+        # Add density heatmap if requested
+        if show_heatmap and len(df_filtered) > 1:
+            if len(df_filtered) > self.MAX_RAW_RENDER_POINTS:
+                # Bin sightings to a coarse grid and feed the non-empty
+                # cells; payload size then depends on the grid, not N
+                counts, lat_edges, lon_edges = np.histogram2d(
+                    df_filtered['latitude'].to_numpy(),
+                    df_filtered['longitude'].to_numpy(),
+                    bins=(200, 200),
+                    weights=df_filtered['individualcount'].to_numpy()
+                )
+                lat_idx, lon_idx = np.nonzero(counts)
+                heat_lat = ((lat_edges[:-1] + lat_edges[1:]) / 2)[lat_idx]
+                heat_lon = ((lon_edges[:-1] + lon_edges[1:]) / 2)[lon_idx]
+                heat_z = counts[lat_idx, lon_idx]
+            else:
+                heat_lat = df_filtered['latitude']
+                heat_lon = df_filtered['longitude']
+                heat_z = df_filtered['individualcount']
+
+            traces.append(go.Densitymapbox(
+                lat=self._round_coords(heat_lat),
+                lon=self._round_coords(heat_lon),
+                z=heat_z,
+                radius=30,
+                colorscale='Viridis',
+                name='Density',
+                opacity=0.5
+            ))
+        
+        # Merge the per-call title into the shared static layout
+        layout = dict(
+            self.BASE_MAP_LAYOUT,
+            title=f'Whale Sightings Map - {species if species else "All Species"}'
+        )
+
+        return {'data': traces, 'layout': layout}
+    
+    def _filter_data(self,
+                    species: Optional[str],
+                    time_range: Optional[Dict[str, datetime]]) -> pd.DataFrame:
+        """Filter data based on species and time range."""
+        # Build one combined mask over raw arrays and slice once,
+        # instead of copying the full frame up front and filtering it
+        # down in stages
+        mask = np.ones(len(self.df), dtype=bool)
+
+        if species:
+            mask &= self.df['scientificname'].to_numpy() == species
+
+        if time_range:
+            eventdate = self.df['eventdate'].to_numpy()
+            mask &= (
+                (eventdate >= np.datetime64(time_range['start'])) &
+                (eventdate <= np.datetime64(time_range['end']))
+            )
+
+        return self.df.iloc[mask]
+    
+    def create_temporal_plot(self,
+                           species: Optional[str] = None,
+                           time_period: str = 'month') -> go.Figure:
+        """
+        Create a temporal plot of whale sightings.
+        
+        Args:
+            species: Filter by specific species
+            time_period: Time period for aggregation ('month' or 'year')
+            
+        Returns:
+            plotly.graph_objects.Figure
+        """
+        # Filter data from the cached per-species view when possible
+        if species:
+            view = self._by_species.get(species)
+            df_filtered = view['frame'] if view is not None else self.df.iloc[0:0]
+        else:
+            df_filtered = self._filter_data(species, None)
+
+        # Group by time period
+        # Count sightings per bucket with bincount over an integer key;
+        # one C-level scan instead of the groupby/size machinery
+        if df_filtered.empty:
+            dates, values = [], []
+        elif time_period == 'month':
+            year = df_filtered['year'].to_numpy(np.int64)
+            month = df_filtered['month'].to_numpy(np.int64)
+            key = year * 12 + (month - 1)
+            base = key.min()
+            counts = np.bincount(key - base)
+            buckets = np.flatnonzero(counts) + base
+            dates = pd.to_datetime({
+                'year': buckets // 12,
+                'month': buckets % 12 + 1,
+                'day': 1
+            })
+            values = counts[buckets - base]
+        else:
+            year = df_filtered['year'].to_numpy(np.int64)
+            base = year.min()
+            counts = np.bincount(year - base)
+            buckets = np.flatnonzero(counts) + base
+            dates = pd.to_datetime(pd.Series(buckets), format='%Y')
+            values = counts[buckets - base]
+
+        # Create plot
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=dates,
+            y=values,
+            mode='lines+markers',
+            name='Sightings'
+        ))
+        
+        # Update layout
+        fig.update_layout(
+            title='Temporal Distribution of Whale Sightings',
+            xaxis_title='Date',
+            yaxis_title='Number of Sightings',
+            hovermode='x unified'
+        )
+        
+        return fig
+    
+    def create_habitat_preference_plot(self,
+                                     species: str,
+                                     time_period: str = 'season') -> go.Figure:
+        """
+        Create a plot showing habitat preferences by season or year.
+        
+        Args:
+            species: Species to analyze
+            time_period: Time period for grouping ('season' or 'year')
+            
+        Returns:
+            plotly.graph_objects.Figure
+        """
+        # Filter data for species from the cached per-species view
+        view = self._by_species.get(species)
+        df_species = view['frame'] if view is not None else self.df.iloc[0:0]
+        
+        # Compute per-group mean/std with reduceat over sorted arrays;
+        # for the handful of seasons or years this avoids the
+        # MultiIndex-column agg machinery entirely
+        sub = df_species.sort_values(time_period)
+        period_keys = sub[time_period].astype(str).to_numpy()
+        keys, starts = np.unique(period_keys, return_index=True)
+        order = np.argsort(starts)  # keep groups in appearance order
+        keys, starts = keys[order], starts[order]
+        counts = np.diff(np.r_[starts, len(sub)])
+
+        def group_stats(values: np.ndarray):
+            sums = np.add.reduceat(values, starts) if len(values) else np.array([])
+            squares = np.add.reduceat(values * values, starts) if len(values) else np.array([])
+            mean = sums / counts
+            var = np.maximum(squares - counts * mean**2, 0.0)
+            # Sample std (ddof=1) to match pandas; single-row groups get NaN
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(var / np.where(counts > 1, counts - 1, np.nan))
+            return mean, std
+
+        lat_mean, lat_std = group_stats(sub['latitude'].to_numpy(np.float64))
+        lon_mean, lon_std = group_stats(sub['longitude'].to_numpy(np.float64))
+
+        # Create plot
+        fig = go.Figure()
+
+        # Add error bars for latitude
+        fig.add_trace(go.Scatter(
+            x=keys,
+            y=lat_mean,
+            error_y=dict(
+                type='data',
+                array=lat_std,
+                visible=True
+            ),
+            name='Latitude',
+            mode='lines+markers'
+        ))
+
+        # Add error bars for longitude
+        fig.add_trace(go.Scatter(
+            x=keys,
+            y=lon_mean,
+            error_y=dict(
+                type='data',
+                array=lon_std,
+                visible=True
+            ),
+            name='Longitude',
+            mode='lines+markers'
+        ))
+        
+        # Update layout
+        fig.update_layout(
+            title=f'Habitat Preferences for {species} by {time_period}',
+            xaxis_title=time_period.capitalize(),
+            yaxis_title='Coordinates',
+            hovermode='x unified'
+        )
+        
         return fig 
\ No newline at end of file
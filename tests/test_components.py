@@ -48,7 +48,40 @@ class TestWhaleWatchComponents(unittest.TestCase):
         
         # Check if dates are properly converted
         self.assertTrue(pd.api.types.is_datetime64_any_dtype(cleaned_data['eventdate']))
+
+        # String coordinates (e.g. raw CSV/API input) are coerced to
+        # numeric, and unparseable values are dropped
+        string_data = pd.DataFrame({
+            'scientificname': ['Megaptera novaeangliae'] * 3,
+            'latitude': ['10.5', '12.0', 'bogus'],
+            'longitude': ['75.0', '80.0', '85.0'],
+            'eventdate': ['2010-01-01', '2010-01-02', '2010-01-03'],
+            'individualcount': [1, 2, 3]
+        })
+        cleaned_strings = self.data_cleaner.clean_data(string_data)
+        self.assertEqual(len(cleaned_strings), 2)
+        self.assertTrue(pd.api.types.is_numeric_dtype(cleaned_strings['latitude']))
+        self.assertTrue(pd.api.types.is_numeric_dtype(cleaned_strings['longitude']))
     
+    def test_duplicate_removal(self):
+        """Test that dedup drops exact repeats but keeps distinct rows."""
+        date = pd.Timestamp('2010-06-15')
+        df = pd.DataFrame({
+            'scientificname': ['Megaptera novaeangliae'] * 4,
+            'latitude': [10.5, 10.5, 0.00001, 0.0],
+            'longitude': [75.0, 75.0, 0.0, 167.77216],
+            'eventdate': [date] * 4,
+            'individualcount': [1, 1, 1, 1]
+        })
+        cleaned = self.data_cleaner.clean_data(df)
+
+        # The exact repeat is dropped, while the two distinct sightings
+        # (chosen so lossy key-folding schemes would collide them) survive
+        self.assertEqual(len(cleaned), 3)
+        self.assertEqual(
+            len(cleaned[['latitude', 'longitude']].drop_duplicates()), 3
+        )
+
     def test_habitat_analysis(self):
         """Test the habitat analysis functionality."""
         # Test habitat preferences analysis